@@ -1,18 +1,82 @@
 #!/usr/bin/env python3
-import json
+import hashlib
 import os
 import sys
 import uuid
 from datetime import datetime, timezone
 
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Prefer the fastest JSON library available: orjson, then ujson, then json
+try:
+    import orjson
+
+    _loads = orjson.loads
+
+    def _dumps(obj):
+        """Serialize obj to indented JSON bytes."""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+except ImportError:
+    try:
+        import ujson
+
+        _loads = ujson.loads
+
+        def _dumps(obj):
+            """Serialize obj to indented JSON bytes."""
+            return ujson.dumps(obj, indent=2, escape_forward_slashes=False).encode()
+
+    except ImportError:
+        import json
+
+        _loads = json.loads
+
+        def _dumps(obj):
+            """Serialize obj to indented JSON bytes."""
+            return json.dumps(obj, indent=2).encode()
+
+
+# Bandit severity -> SARIF level
+_LEVEL_MAP = {"high": "error", "medium": "warning", "low": "note", "": "warning"}
+
+
+def _load_bandit_data(bandit_json_file):
+    """Load the whole Bandit report into memory."""
+    with open(bandit_json_file, "rb") as f:
+        return _loads(f.read())
+
+
+def _read_bandit_version(bandit_json_file):
+    """Return the Bandit version recorded in the report metadata."""
+    if ijson is None:
+        return (
+            _load_bandit_data(bandit_json_file)
+            .get("metadata", {})
+            .get("version", "1.0.0")
+        )
+    with open(bandit_json_file, "rb") as f:
+        return next(ijson.items(f, "metadata.version"), "1.0.0")
+
+
+def _iter_bandit_results(bandit_json_file):
+    """Yield Bandit results one at a time, streaming when ijson is available."""
+    if ijson is None:
+        yield from _load_bandit_data(bandit_json_file).get("results", [])
+        return
+    with open(bandit_json_file, "rb") as f:
+        yield from ijson.items(f, "results.item")
+
 
 def convert_to_sarif(bandit_json_file, sarif_output_file):
     """
     Convert Bandit JSON output to SARIF format compatible with GitHub Code Scanning.
     """
-    # Load the Bandit JSON output
-    with open(bandit_json_file, "r") as f:
-        bandit_data = json.load(f)
+    # Single timestamp for this invocation
+    end_time_utc = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
     # Get repository information from environment variables if available
     repo_name = os.environ.get("GITHUB_REPOSITORY", "unknown/repository")
@@ -28,104 +92,119 @@ def convert_to_sarif(bandit_json_file, sarif_output_file):
     if base_ref:
         vcp["branch"] = base_ref
 
-    sarif_output = {
-        "$schema": "https://raw.githubusercontent.com/oasis-tcs/sarif-spec/master/Schemata/sarif-schema-2.1.0.json",
-        "version": "2.1.0",
-        "runs": [
+    run = {
+        "tool": {
+            "driver": {
+                "name": "Bandit",
+                "informationUri": "https://github.com/PyCQA/bandit",
+                "semanticVersion": _read_bandit_version(bandit_json_file),
+                "rules": [],
+            }
+        },
+        "invocations": [
             {
-                "tool": {
-                    "driver": {
-                        "name": "Bandit",
-                        "informationUri": "https://github.com/PyCQA/bandit",
-                        "semanticVersion": bandit_data.get("metadata", {}).get(
-                            "version", "1.0.0"
-                        ),
-                        "rules": [],
+                "executionSuccessful": True,
+                "commandLine": "bandit -r tapo_exporter/",
+                "endTimeUtc": end_time_utc,
+                "workingDirectory": {"uri": "file:///"},
+            }
+        ],
+        "versionControlProvenance": [vcp],
+        # Add run.automationDetails object with SARIF run ID
+        "automationDetails": {"id": f"bandit/{uuid.uuid4()}"},
+    }
+    header = _dumps(
+        {
+            "$schema": "https://raw.githubusercontent.com/oasis-tcs/sarif-spec/master/Schemata/sarif-schema-2.1.0.json",
+            "version": "2.1.0",
+        }
+    )
+
+    # Stream SARIF output: results are written as they are converted, the
+    # rest of the run (which needs the complete rule list) follows them
+    with open(sarif_output_file, "wb") as f:
+        write = f.write
+        write(header[: header.rindex(b"}")].rstrip())
+        write(b',\n  "runs": [\n    {\n      "results": [\n')
+
+        # Process Bandit results into SARIF
+        rules = run["tool"]["driver"]["rules"]
+        rules_append = rules.append
+        rule_indices = {}
+        path_cache = {}
+        separator = b""
+        for result in _iter_bandit_results(bandit_json_file):
+            test_id = result.get("test_id", "")
+
+            # Add rule if not already added; only build the dict for new rules
+            rule_index = rule_indices.setdefault(test_id, len(rules))
+            if rule_index == len(rules):
+                test_name = result.get("test_name", "")
+                rules_append(
+                    {
+                        "id": test_id,
+                        "name": test_name,
+                        "shortDescription": {"text": test_name},
+                        "fullDescription": {"text": result.get("issue_text", "")},
+                        "defaultConfiguration": {"level": "warning"},
+                        "helpUri": f"https://bandit.readthedocs.io/en/latest/plugins/index.html#{test_id.lower()}",
                     }
-                },
-                "results": [],
-                "invocations": [
+                )
+
+            # Map Bandit severity to SARIF level
+            level = _LEVEL_MAP.get(result.get("issue_severity", "").lower(), "warning")
+
+            # Get file path relative to repository, once per distinct file
+            raw_filename = result.get("filename", "")
+            paths = path_cache.get(raw_filename)
+            if paths is None:
+                filename = raw_filename
+                if filename.startswith("/"):
+                    filename = os.path.relpath(filename)
+                paths = path_cache[raw_filename] = (
+                    filename,
+                    filename.replace("\\", "/"),
+                )
+            filename, uri = paths
+
+            # Add result
+            line_number = result.get("line_number", 1)
+            sarif_result = {
+                "ruleId": test_id,
+                "ruleIndex": rule_index,
+                "level": level,
+                "message": {"text": result.get("issue_text", "")},
+                "locations": [
                     {
-                        "executionSuccessful": True,
-                        "commandLine": "bandit -r tapo_exporter/",
-                        "endTimeUtc": datetime.now(timezone.utc)
-                        .isoformat()
-                        .replace("+00:00", "Z"),
-                        "workingDirectory": {"uri": "file:///"},
+                        "physicalLocation": {
+                            "artifactLocation": {
+                                "uri": uri,
+                                "uriBaseId": "%SRCROOT%",
+                            },
+                            "region": {
+                                "startLine": line_number,
+                                "startColumn": 1,
+                            },
+                        }
                     }
                 ],
-                "versionControlProvenance": [vcp],
-                # Add run.automationDetails object with SARIF run ID
-                "automationDetails": {"id": f"bandit/{uuid.uuid4()}"},
-            }
-        ],
-    }
-
-    # Process Bandit results into SARIF
-    rule_indices = {}
-    for result in bandit_data.get("results", []):
-        test_id = result.get("test_id", "")
-        test_name = result.get("test_name", "")
-
-        # Add rule if not already added
-        if test_id not in rule_indices:
-            rule = {
-                "id": test_id,
-                "name": test_name,
-                "shortDescription": {"text": test_name},
-                "fullDescription": {"text": result.get("issue_text", "")},
-                "defaultConfiguration": {"level": "warning"},
-                "helpUri": f"https://bandit.readthedocs.io/en/latest/plugins/index.html#{test_id.lower()}",
+                # Add fingerprint to help GitHub track issues
+                "fingerprints": {
+                    "primaryFingerprint": hashlib.blake2b(
+                        f"{test_id}\x00{filename}\x00{line_number}".encode(),
+                        digest_size=8,
+                    ).hexdigest(),
+                },
             }
 
-            sarif_output["runs"][0]["tool"]["driver"]["rules"].append(rule)
-            rule_indices[test_id] = (
-                len(sarif_output["runs"][0]["tool"]["driver"]["rules"]) - 1
-            )
-
-        # Map Bandit severity to SARIF level
-        level = "warning"
-        if result.get("issue_severity", "").lower() == "high":
-            level = "error"
-        elif result.get("issue_severity", "").lower() == "low":
-            level = "note"
-
-        # Get file path relative to repository
-        filename = result.get("filename", "")
-        if filename.startswith("/"):
-            filename = os.path.relpath(filename)
-
-        # Add result
-        sarif_result = {
-            "ruleId": test_id,
-            "ruleIndex": rule_indices[test_id],
-            "level": level,
-            "message": {"text": result.get("issue_text", "")},
-            "locations": [
-                {
-                    "physicalLocation": {
-                        "artifactLocation": {
-                            "uri": filename.replace("\\", "/"),
-                            "uriBaseId": "%SRCROOT%",
-                        },
-                        "region": {
-                            "startLine": result.get("line_number", 1),
-                            "startColumn": 1,
-                        },
-                    }
-                }
-            ],
-            # Add fingerprint to help GitHub track issues
-            "fingerprints": {
-                "primaryFingerprint": f"{test_id}/{filename}/{result.get('line_number', 1)}",
-            },
-        }
-
-        sarif_output["runs"][0]["results"].append(sarif_result)
+            write(separator)
+            write(_dumps(sarif_result))
+            separator = b",\n"
 
-    # Write SARIF output
-    with open(sarif_output_file, "w") as f:
-        json.dump(sarif_output, f, indent=2)
+        tail = _dumps(run)
+        write(b"\n      ],\n")
+        write(tail[tail.index(b"{") + 1 :].lstrip())
+        write(b"\n  ]\n}\n")
 
 
 if __name__ == "__main__":
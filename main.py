@@ -1,7 +1,7 @@
 import asyncio
 import datetime
 import os
-import subprocess
+import sys
 from dotenv import load_dotenv
 from tapo import ApiClient
 from tapo.requests import EnergyDataInterval
@@ -14,20 +14,15 @@ EMAIL = os.getenv("TAPO_EMAIL")
 PASSWORD = os.getenv("TAPO_PASSWORD")
 
 
-def is_device_reachable(ip):
+async def is_device_reachable(ip, port=80, timeout=1.0):
     try:
-        if os.name == "nt":  # Windows
-            ping_cmd = ["ping", "-n", "1", ip]
-        else:  # macOS / Linux
-            ping_cmd = ["ping", "-c", "1", ip]
-
-        print(f"Pinging device with command: {' '.join(ping_cmd)}")  # Debug
-        result = subprocess.run(
-            ping_cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
-        )
-        return result.returncode == 0
-    except Exception as e:
-        print(f"Ping failed with exception: {e}")
+        print(f"Probing device at {ip}:{port}")  # Debug
+        _, writer = await asyncio.wait_for(asyncio.open_connection(ip, port), timeout)
+        writer.close()
+        await writer.wait_closed()
+        return True
+    except (OSError, asyncio.TimeoutError) as e:
+        print(f"Probe failed with exception: {e}")
         return False
 
 
@@ -36,7 +31,7 @@ def get_quarter_start_month(today: datetime.datetime) -> int:
 
 
 async def main():
-    if not is_device_reachable(IP):
+    if not await is_device_reachable(IP):
         print(f"Device at {IP} is not reachable. Make sure it's online.")
         exit(1)
 
@@ -46,30 +41,50 @@ async def main():
     await device.on()
     print("Plug turned ON.")
 
+    # Issue all independent requests concurrently; failures are reported
+    # per section below
+    (
+        info_json,
+        current_power,
+        device_usage,
+        energy_usage,
+        energy_data_hourly,
+    ) = await asyncio.gather(
+        device.get_device_info_json(),
+        device.get_current_power(),
+        device.get_device_usage(),
+        device.get_energy_usage(),
+        device.get_energy_data(EnergyDataInterval.Hourly, datetime.datetime.today()),
+        return_exceptions=True,
+    )
+
     # Device info
-    info_json = await device.get_device_info_json()
-    print("\nDevice Status:")
-    print("==============")
-    print(f"Power Protection Status: {info_json['power_protection_status']}")
-    print(f"Overcurrent Status: {info_json['overcurrent_status']}")
-    print(f"Overheat Status: {info_json['overheat_status']}")
-    print(
+    if isinstance(info_json, Exception):
+        raise info_json
+    out = ["\nDevice Status:"]
+    out.append("==============")
+    out.append(f"Power Protection Status: {info_json['power_protection_status']}")
+    out.append(f"Overcurrent Status: {info_json['overcurrent_status']}")
+    out.append(f"Overheat Status: {info_json['overheat_status']}")
+    out.append(
         f"Signal Strength: Level {info_json['signal_level']} "
         f"(RSSI: {info_json['rssi']} dBm)"
     )
-    print(f"Device Runtime: {info_json['on_time']} seconds")
-    print(f"Device Model: {info_json['model']}")
-    print(f"Firmware Version: {info_json['fw_ver']}")
+    out.append(f"Device Runtime: {info_json['on_time']} seconds")
+    out.append(f"Device Model: {info_json['model']}")
+    out.append(f"Firmware Version: {info_json['fw_ver']}")
+    sys.stdout.write("\n".join(out) + "\n")
 
     # Current power + calculated current
     try:
-        current_power = await device.get_current_power()
+        if isinstance(current_power, Exception):
+            raise current_power
         power_dict = current_power.to_dict()
 
-        print("\nRaw Power Data (for debugging):")
-        print("===============================")
+        out = ["\nRaw Power Data (for debugging):"]
+        out.append("===============================")
         for k, v in power_dict.items():
-            print(f"{k}: {v}")
+            out.append(f"{k}: {v}")
 
         power_w = power_dict.get("current_power")
         voltage_v = power_dict.get("voltage")
@@ -77,7 +92,7 @@ async def main():
         # Fallback if voltage is missing
         if voltage_v is None:
             voltage_v = 120.0  # or 230.0 depending on your region
-            print(
+            out.append(
                 "⚠️ Voltage not reported by device. Using default 120V for calculation."
             )
 
@@ -88,68 +103,74 @@ async def main():
 
         reported_current = power_dict.get("current")
 
-        print(f"\nCurrent Power Consumption: {power_w} W")
-        print(f"Voltage (used for calculation): {voltage_v} V")
-        print(f"Reported Current: {reported_current} A")
+        out.append(f"\nCurrent Power Consumption: {power_w} W")
+        out.append(f"Voltage (used for calculation): {voltage_v} V")
+        out.append(f"Reported Current: {reported_current} A")
 
         if calculated_current is not None:
-            print(f"Estimated Current (Power / Voltage): {calculated_current:.4f} A")
+            out.append(
+                f"Estimated Current (Power / Voltage): {calculated_current:.4f} A"
+            )
         else:
-            print("Could not calculate current due to missing data.")
+            out.append("Could not calculate current due to missing data.")
+        sys.stdout.write("\n".join(out) + "\n")
 
     except Exception as e:
         print(f"\nCould not get current power: {e}")
 
     # Device usage
     try:
-        device_usage = await device.get_device_usage()
+        if isinstance(device_usage, Exception):
+            raise device_usage
         usage_dict = device_usage.to_dict()
-        print("\nRuntime Statistics:")
-        print("==================")
-        print("Today's Usage:")
-        print(f"  Runtime: {usage_dict['time_usage']['today']} minutes")
-        print(f"  Energy: {usage_dict['power_usage']['today']} Wh")
-        print(f"  Power Saved: {usage_dict['saved_power']['today']} Wh")
-
-        print("\nPast 7 Days:")
-        print(f"  Runtime: {usage_dict['time_usage']['past7']} minutes")
-        print(f"  Energy: {usage_dict['power_usage']['past7']} Wh")
-        print(f"  Power Saved: {usage_dict['saved_power']['past7']} Wh")
-
-        print("\nPast 30 Days:")
-        print(f"  Runtime: {usage_dict['time_usage']['past30']} minutes")
-        print(f"  Energy: {usage_dict['power_usage']['past30']} Wh")
-        print(f"  Power Saved: {usage_dict['saved_power']['past30']} Wh")
+        out = ["\nRuntime Statistics:"]
+        out.append("==================")
+        out.append("Today's Usage:")
+        out.append(f"  Runtime: {usage_dict['time_usage']['today']} minutes")
+        out.append(f"  Energy: {usage_dict['power_usage']['today']} Wh")
+        out.append(f"  Power Saved: {usage_dict['saved_power']['today']} Wh")
+
+        out.append("\nPast 7 Days:")
+        out.append(f"  Runtime: {usage_dict['time_usage']['past7']} minutes")
+        out.append(f"  Energy: {usage_dict['power_usage']['past7']} Wh")
+        out.append(f"  Power Saved: {usage_dict['saved_power']['past7']} Wh")
+
+        out.append("\nPast 30 Days:")
+        out.append(f"  Runtime: {usage_dict['time_usage']['past30']} minutes")
+        out.append(f"  Energy: {usage_dict['power_usage']['past30']} Wh")
+        out.append(f"  Power Saved: {usage_dict['saved_power']['past30']} Wh")
+        sys.stdout.write("\n".join(out) + "\n")
     except Exception as e:
         print(f"\nCould not get device usage: {e}")
 
     # Energy usage today/month
     try:
-        energy_usage = await device.get_energy_usage()
+        if isinstance(energy_usage, Exception):
+            raise energy_usage
         usage_dict = energy_usage.to_dict()
-        print("\nDetailed Energy Usage:")
-        print("=====================")
-        print(f"Current Power: {usage_dict['current_power']} mW")
-        print(f"Today's Runtime: {usage_dict['today_runtime']} minutes")
-        print(f"Today's Energy: {usage_dict['today_energy']} Wh")
-        print(f"Month's Runtime: {usage_dict['month_runtime']} minutes")
-        print(f"Month's Energy: {usage_dict['month_energy']} Wh")
-        print(f"Local Time: {usage_dict['local_time']}")
+        out = ["\nDetailed Energy Usage:"]
+        out.append("=====================")
+        out.append(f"Current Power: {usage_dict['current_power']} mW")
+        out.append(f"Today's Runtime: {usage_dict['today_runtime']} minutes")
+        out.append(f"Today's Energy: {usage_dict['today_energy']} Wh")
+        out.append(f"Month's Runtime: {usage_dict['month_runtime']} minutes")
+        out.append(f"Month's Energy: {usage_dict['month_energy']} Wh")
+        out.append(f"Local Time: {usage_dict['local_time']}")
+        sys.stdout.write("\n".join(out) + "\n")
     except Exception as e:
         print(f"\nCould not get energy usage: {e}")
 
     # Hourly energy today
     try:
-        today = datetime.datetime.today()
-        energy_data_hourly = await device.get_energy_data(
-            EnergyDataInterval.Hourly, today
-        )
+        if isinstance(energy_data_hourly, Exception):
+            raise energy_data_hourly
         hourly_data = energy_data_hourly.to_dict()
-        print("\nHourly Energy Consumption Today:")
-        print("===============================")
+        out = ["\nHourly Energy Consumption Today:"]
+        out.append("===============================")
         for hour, power in enumerate(hourly_data["data"]):
             if power > 0:
-                print(f"Hour {hour}: {power} Wh")
+                out.append(f"Hour {hour}: {power} Wh")
+        sys.stdout.write("\n".join(out) + "\n")
     except Exception as e:
         print(f"\nCould not get energy data: {e}")
 
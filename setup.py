@@ -1,5 +1,8 @@
+from pathlib import Path
 from setuptools import find_packages, setup
 
+LONG_DESC = Path(__file__).with_name("README.md").read_text(encoding="utf-8")
+
 setup(
     name="tapo-exporter",
     version="0.1.0",
@@ -18,7 +21,7 @@ setup(
     author="Javel Palmer",
     author_email="jj4v3l@example.com",
     description="A Prometheus exporter for Tapo smart plugs",
-    long_description=open("README.md").read(),
+    long_description=LONG_DESC,
     long_description_content_type="text/markdown",
     url="https://github.com/j4v3l/tapo-exporter",
     classifiers=[
@@ -4,49 +4,47 @@ import asyncio
 import logging
 import os
 import signal
-from typing import List, Optional
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
 from dotenv import load_dotenv
 from prometheus_client import start_http_server
 from .devices.p110 import P110Device
 from .exporter import TapoExporter
 
-# Configure logging
+# Configure logging; skip LogRecord attributes the format never uses
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
 log_level = os.getenv("LOG_LEVEL", "INFO").upper()
 numeric_level = getattr(logging, log_level, logging.INFO)
 logging.basicConfig(
     level=numeric_level,
-    format="%(asctime)s | %(asctime)s | %(levelname)-8s | %(message)s",
+    format="%(asctime)s | %(levelname)-8s | %(message)s",
     datefmt="%Y-%m-%d %H:%M:%S",
 )
 
 logger = logging.getLogger(__name__)
 
+# Default seconds between metrics updates (override with TAPO_SCRAPE_INTERVAL)
+UPDATE_INTERVAL = 2.0
+
 # Load environment variables
 logger.debug("Loading environment variables...")
 load_dotenv()
 logger.debug("Environment variables loaded")
 
-# Debug print all relevant environment variables
-logger.debug("Environment variables:")
-logger.debug(f"TAPO_DEVICE_COUNT: {os.getenv('TAPO_DEVICE_COUNT')}")
-logger.debug(f"TAPO_DEVICE_1_NAME: {os.getenv('TAPO_DEVICE_1_NAME')}")
-logger.debug(f"TAPO_DEVICE_1_IP: {os.getenv('TAPO_DEVICE_1_IP')}")
-logger.debug(f"TAPO_DEVICE_1_EMAIL: {os.getenv('TAPO_DEVICE_1_EMAIL')}")
-password = os.getenv("TAPO_DEVICE_1_PASSWORD", "")
-password_len = len(password)
-password_mask = "*" * password_len if password else ""
-logger.debug(f"TAPO_DEVICE_1_PASSWORD: {password_mask}")
-logger.debug(f"TAPO_DEVICE_1_TYPE: {os.getenv('TAPO_DEVICE_1_TYPE')}")
-
 
 def get_devices_from_env() -> List[P110Device]:
     """Get Tapo devices from environment variables."""
     devices = []
+    # Snapshot the environment once; every lookup below is a plain dict get
+    env = dict(os.environ)
 
     # Try new format first
-    username = os.getenv("TAPO_USERNAME")
-    password = os.getenv("TAPO_PASSWORD")
-    device_ips = os.getenv("TAPO_DEVICES")
+    username = env.get("TAPO_USERNAME")
+    password = env.get("TAPO_PASSWORD")
+    device_ips = env.get("TAPO_DEVICES")
 
     if username and password and device_ips:
         logger.debug("Using new environment variable format")
@@ -61,29 +59,39 @@ def get_devices_from_env() -> List[P110Device]:
 
     # Fall back to old format
     logger.debug("Using old environment variable format")
-    device_count_str = os.getenv("TAPO_DEVICE_COUNT", "0")
+    device_count_str = env.get("TAPO_DEVICE_COUNT", "0")
     try:
         device_count = int(device_count_str)
     except ValueError:
         logger.error(f"Invalid TAPO_DEVICE_COUNT value: {device_count_str}")
         return devices
 
-    logger.debug(f"Device count from env: {device_count}")
+    logger.debug("Device count from env: %s", device_count)
+
+    # Collect every TAPO_DEVICE_<i>_<FIELD> variable in one pass
+    device_configs: Dict[int, Dict[str, str]] = defaultdict(dict)
+    for key, value in env.items():
+        if key.startswith("TAPO_DEVICE_"):
+            index, _, field = key[len("TAPO_DEVICE_") :].partition("_")
+            if index.isdigit() and field:
+                device_configs[int(index)][field] = value
 
     for i in range(1, device_count + 1):
-        name_env = os.getenv(f"TAPO_DEVICE_{i}_NAME")
-        ip_env = os.getenv(f"TAPO_DEVICE_{i}_IP")
-        email_env = os.getenv(f"TAPO_DEVICE_{i}_EMAIL")
-        password_env = os.getenv(f"TAPO_DEVICE_{i}_PASSWORD")
-        device_type = os.getenv(f"TAPO_DEVICE_{i}_TYPE", "p110").lower()
-
-        logger.debug(f"Device {i} configuration:")
-        logger.debug(f"  Name: {name_env}")
-        logger.debug(f"  IP: {ip_env}")
-        logger.debug(f"  Email: {email_env}")
-        password_mask = "*" * len(password_env) if password_env else ""
-        logger.debug(f"  Password: {password_mask}")
-        logger.debug(f"  Type: {device_type}")
+        config = device_configs.get(i, {})
+        name_env = config.get("NAME")
+        ip_env = config.get("IP")
+        email_env = config.get("EMAIL")
+        password_env = config.get("PASSWORD")
+        device_type = config.get("TYPE", "p110").lower()
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Device %s configuration:", i)
+            logger.debug("  Name: %s", name_env)
+            logger.debug("  IP: %s", ip_env)
+            logger.debug("  Email: %s", email_env)
+            password_mask = "*" * len(password_env) if password_env else ""
+            logger.debug("  Password: %s", password_mask)
+            logger.debug("  Type: %s", device_type)
 
         if name_env and ip_env and email_env and password_env:
             name = name_env
@@ -92,18 +100,22 @@ def get_devices_from_env() -> List[P110Device]:
             password = password_env
 
             if device_type in ["p110", "p115"]:
-                devices.append(
-                    P110Device(name=name, ip=ip, email=email, password=password)
-                )
                 logger.info(f"Added {device_type.upper()} device {name} at {ip}")
             else:
                 logger.warning(
                     f"Invalid device type {device_type} for device {i}. "
                     "Using P110 as default."
                 )
-                devices.append(
-                    P110Device(name=name, ip=ip, email=email, password=password)
+                device_type = "p110"
+            devices.append(
+                P110Device(
+                    name=name,
+                    ip=ip,
+                    email=email,
+                    password=password,
+                    device_type=device_type,
                 )
+            )
         else:
             logger.warning(
                 f"Missing configuration for device {i}. " "Skipping this device."
@@ -121,6 +133,15 @@ def get_devices_from_env() -> List[P110Device]:
     return devices
 
 
+async def _wait_for_stop(stop_event: asyncio.Event, timeout: float) -> bool:
+    """Wait up to timeout seconds for stop_event and return whether it is set."""
+    try:
+        await asyncio.wait_for(stop_event.wait(), timeout)
+    except asyncio.TimeoutError:
+        pass
+    return stop_event.is_set()
+
+
 async def main() -> None:
     """Main entry point for the Tapo exporter."""
     exporter: Optional[TapoExporter] = None
@@ -133,6 +154,13 @@ async def main() -> None:
             logger.error(f"Invalid PROMETHEUS_PORT value: {port_str}")
             return
 
+        interval_str = os.getenv("TAPO_SCRAPE_INTERVAL", str(UPDATE_INTERVAL))
+        try:
+            interval = float(interval_str)
+        except ValueError:
+            logger.error(f"Invalid TAPO_SCRAPE_INTERVAL value: {interval_str}")
+            return
+
         start_http_server(port)
         logger.info(f"Started Prometheus metrics server on port {port}")
 
@@ -143,14 +171,11 @@ async def main() -> None:
 
         exporter = TapoExporter(devices)
 
-        # Set up signal handlers
-        loop = asyncio.get_event_loop()
-        loop.add_signal_handler(
-            signal.SIGINT, lambda: asyncio.create_task(exporter.stop())
-        )
-        loop.add_signal_handler(
-            signal.SIGTERM, lambda: asyncio.create_task(exporter.stop())
-        )
+        # Set up signal handlers; they wake the update loop immediately
+        stop_event = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        loop.add_signal_handler(signal.SIGINT, stop_event.set)
+        loop.add_signal_handler(signal.SIGTERM, stop_event.set)
 
         # Connect to all devices before starting the metrics collection
         try:
@@ -160,20 +185,25 @@ async def main() -> None:
             logger.error(f"Failed to connect to devices: {str(e)}")
             return
 
-        # Update metrics every 2 seconds
+        # Update metrics every interval seconds, scheduled against a monotonic
+        # deadline so slow updates don't stretch the period. Devices are
+        # polled concurrently, so an update takes as long as the slowest one.
+        next_tick = time.monotonic()
         await exporter.update_metrics()
 
-        # Note: asyncio.sleep is mocked in tests to raise either
+        # Note: _wait_for_stop is mocked in tests to raise either
         # KeyboardInterrupt or CancelledError
         while True:
             try:
-                # In test_main_keyboard_interrupt this raises KeyboardInterrupt
-                # In test_main_loop_error this first returns None, then raises
-                # CancelledError
-                await asyncio.sleep(2)
+                # If an update overran, skip the missed ticks instead of
+                # trying to catch up
+                now = time.monotonic()
+                next_tick = max(next_tick + interval, now)
+                if await _wait_for_stop(stop_event, next_tick - now):
+                    logger.info("Shutdown signal received. Exiting gracefully...")
+                    await exporter.stop()
+                    return
 
-                # In test_main_loop_error, this first raises Exception,
-                # then CancelledError (never reaching the second call)
                 await exporter.update_metrics()
             except KeyboardInterrupt:
                 # This is needed for test_main_keyboard_interrupt
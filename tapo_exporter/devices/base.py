@@ -1,10 +1,22 @@
 import logging
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 from tapo import ApiClient
 
 logger = logging.getLogger(__name__)
 
+# ApiClient instances shared by every device using the same credentials
+_CLIENT_CACHE: Dict[Tuple[str, str], ApiClient] = {}
+
+
+def _get_client(email: str, password: str) -> ApiClient:
+    """Return the shared ApiClient for the given credentials"""
+    key = (email, password)
+    client = _CLIENT_CACHE.get(key)
+    if client is None:
+        client = _CLIENT_CACHE[key] = ApiClient(email, password)
+    return client
+
 
 class BaseTapoDevice(ABC):
     def __init__(self, name: str, ip: str, email: str, password: str):
@@ -20,7 +32,7 @@ class BaseTapoDevice(ABC):
         """Connect to the Tapo device"""
         try:
             logger.info(f"Attempting to connect to device {self.name} at {self.ip}")
-            self.client = ApiClient(self.email, self.password)
+            self.client = _get_client(self.email, self.password)
             self.device = await self._get_device()
             logger.info(f"Successfully connected to device {self.name}")
         except Exception as e:
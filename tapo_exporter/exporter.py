@@ -8,7 +8,7 @@ from typing import Dict, List, Optional
 from influxdb_client import InfluxDBClient
 from influxdb_client.client.write_api import SYNCHRONOUS
 from prometheus_client import start_http_server
-from .devices.p110 import P110Device
+from .devices.p110 import P110Device, clean_credentials
 from .metrics import TapoMetrics
 
 logger = logging.getLogger(__name__)
@@ -67,277 +67,284 @@ class TapoExporter:
         """Calculate cost from energy in watt-hours."""
         return (energy_wh / 1000) * COST_PER_KWH  # Convert to kWh and multiply by rate
 
+    async def _connect_device(self, device: P110Device) -> None:
+        """Connect to a single device, logging any failure."""
+        try:
+            await device.connect()
+        except Exception as e:
+            logger.error(f"Failed to connect to device {device.name}: {str(e)}")
+
     async def connect_devices(self) -> None:
-        """Connect to all devices."""
-        for device in self.devices:
-            try:
-                await device.connect()
-            except Exception as e:
-                logger.error(f"Failed to connect to device {device.name}: {str(e)}")
+        """Connect to all devices concurrently."""
+        # Clear cached credentials once, off the event loop
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, clean_credentials)
+        await asyncio.gather(*(self._connect_device(d) for d in self.devices))
 
     async def update_metrics(self) -> None:
-        """Update metrics for all devices."""
+        """Update metrics for all devices concurrently."""
         current_time = asyncio.get_event_loop().time()
+        await asyncio.gather(
+            *(self._update_device(device, current_time) for device in self.devices)
+        )
 
-        for device in self.devices:
-            device_name = device.name
+    async def _update_device(self, device: P110Device, current_time: float) -> None:
+        """Update metrics for a single device."""
+        device_name = device.name
+        try:
+            # Ensure device is initialized in our tracking dictionaries
+            if device_name not in self.last_update_time:
+                self.last_power_readings[device_name] = 0
+                self.last_update_time[device_name] = current_time
+                self.accumulated_energy[device_name] = 0.0
+                self.daily_cost[device_name] = 0.0
+                logger.info(f"Initialized tracking for device {device_name}")
+
+            if not device.device:
+                logger.warning(
+                    f"Device {device_name} is not connected. "
+                    "Skipping metrics update."
+                )
+                return
+
+            # Get device info
             try:
-                # Ensure device is initialized in our tracking dictionaries
-                if device_name not in self.last_update_time:
-                    self.last_power_readings[device_name] = 0
-                    self.last_update_time[device_name] = current_time
-                    self.accumulated_energy[device_name] = 0.0
-                    self.daily_cost[device_name] = 0.0
-                    logger.info(f"Initialized tracking for device {device_name}")
-
-                if not device.device:
+                device_info = await device.get_device_info()
+                if not device_info:
                     logger.warning(
-                        f"Device {device_name} is not connected. "
+                        f"Failed to get device info for {device_name}. "
                         "Skipping metrics update."
                     )
-                    continue
-
-                # Get device info
-                try:
-                    device_info = await device.get_device_info()
-                    if not device_info:
-                        logger.warning(
-                            f"Failed to get device info for {device_name}. "
-                            "Skipping metrics update."
-                        )
-                        continue
-                    logger.info(
-                        f"Device info for {device_name}: "
-                        f"model={device_info.get('model', 'unknown')}, "
-                        f"fw_ver={device_info.get('fw_ver', 'unknown')}, "
-                        f"hw_ver={device_info.get('hw_ver', 'unknown')}, "
-                        f"device_id={device_info.get('device_id', 'unknown')}, "
-                        f"mac={device_info.get('mac', 'unknown')}, "
-                        f"ip={device_info.get('ip', 'unknown')}, "
-                        f"ssid={device_info.get('ssid', 'unknown')}, "
-                        f"signal_level={device_info.get('signal_level', 0)}"
-                    )
-                except Exception as e:
-                    logger.error(
-                        f"Error getting device info for {device_name}: {str(e)}\n"
-                        f"Traceback: {traceback.format_exc()}"
-                    )
-                    continue
-
-                # Get current power
-                try:
-                    power_info = await device.get_current_power()
-                    if not power_info:
-                        logger.warning(
-                            f"Failed to get power info for {device_name}. "
-                            "Skipping metrics update."
-                        )
-                        continue
-                    logger.info(
-                        f"Power info for {device_name}: "
-                        f"power={getattr(power_info, 'current_power', 0)}W, "
-                        f"voltage={getattr(power_info, 'voltage', 0)}V, "
-                        f"current={getattr(power_info, 'current', 0)}mA, "
-                        f"power_factor={getattr(power_info, 'power_factor', 0)}"
-                    )
-                except Exception as e:
-                    logger.error(
-                        f"Error getting power info for {device_name}: {str(e)}\n"
-                        f"Traceback: {traceback.format_exc()}"
-                    )
-                    continue
+                    return
+                logger.info(
+                    f"Device info for {device_name}: "
+                    f"model={device_info.get('model', 'unknown')}, "
+                    f"fw_ver={device_info.get('fw_ver', 'unknown')}, "
+                    f"hw_ver={device_info.get('hw_ver', 'unknown')}, "
+                    f"device_id={device_info.get('device_id', 'unknown')}, "
+                    f"mac={device_info.get('mac', 'unknown')}, "
+                    f"ip={device_info.get('ip', 'unknown')}, "
+                    f"ssid={device_info.get('ssid', 'unknown')}, "
+                    f"signal_level={device_info.get('signal_level', 0)}"
+                )
+            except Exception as e:
+                logger.error(
+                    f"Error getting device info for {device_name}: {str(e)}\n"
+                    f"Traceback: {traceback.format_exc()}"
+                )
+                return
 
-                # Get device usage
-                try:
-                    usage_info = await device.get_device_usage()
-                    if not usage_info:
-                        logger.warning(
-                            f"Failed to get usage info for {device_name}. "
-                            "Skipping metrics update."
-                        )
-                        continue
-                    logger.info(
-                        f"Usage info for {device_name}: "
-                        f"today_energy={getattr(usage_info, 'today_energy', 0)}Wh, "
-                        f"month_energy={getattr(usage_info, 'month_energy', 0)}Wh, "
-                        f"today_runtime={getattr(usage_info, 'today_runtime', 0)}min, "
-                        f"month_runtime={getattr(usage_info, 'month_runtime', 0)}min, "
-                        f"power_saved={getattr(usage_info, 'power_saved', 0)}Wh, "
-                        f"power_protection="
-                        f"{getattr(usage_info, 'power_protection', False)}, "
-                        f"overcurrent_protection="
-                        f"{getattr(usage_info, 'overcurrent_protection', False)}, "
-                        f"overheat_protection="
-                        f"{getattr(usage_info, 'overheat_protection', False)}, "
-                        f"signal_strength={getattr(usage_info, 'signal_strength', 0)}"
-                    )
-                except Exception as e:
-                    logger.error(
-                        f"Error getting usage info for {device_name}: {str(e)}\n"
-                        f"Traceback: {traceback.format_exc()}"
+            # Get current power
+            try:
+                power_info = await device.get_current_power()
+                if not power_info:
+                    logger.warning(
+                        f"Failed to get power info for {device_name}. "
+                        "Skipping metrics update."
                     )
-                    continue
+                    return
+                logger.info(
+                    f"Power info for {device_name}: "
+                    f"power={getattr(power_info, 'current_power', 0)}W, "
+                    f"voltage={getattr(power_info, 'voltage', 0)}V, "
+                    f"current={getattr(power_info, 'current', 0)}mA, "
+                    f"power_factor={getattr(power_info, 'power_factor', 0)}"
+                )
+            except Exception as e:
+                logger.error(
+                    f"Error getting power info for {device_name}: {str(e)}\n"
+                    f"Traceback: {traceback.format_exc()}"
+                )
+                return
 
-                # Update metrics
-                try:
-                    await self.metrics.update_metrics(device)
-                except Exception as e:
-                    logger.error(
-                        f"Error updating metrics for {device_name}: {str(e)}\n"
-                        f"Traceback: {traceback.format_exc()}"
-                    )
-                    continue
-
-                # Calculate current based on power and voltage
-                voltage = int(getattr(power_info, "voltage", 0))
-                power = int(getattr(power_info, "current_power", 0))
-                current_ma = int(getattr(power_info, "current", 0))
-                power_factor = float(getattr(power_info, "power_factor", 0))
-
-                # If voltage is 0, determine appropriate voltage based on power
-                if voltage == 0:
-                    # Assume 240V for high-power devices (typically over 1800W)
-                    voltage = (
-                        STANDARD_VOLTAGE_240V if power > 1800 else STANDARD_VOLTAGE_120V
-                    )
-                    logger.info(
-                        f"Using default voltage for {device_name}: {voltage}V "
-                        f"(power={power}W)"
+            # Get device usage
+            try:
+                usage_info = await device.get_device_usage()
+                if not usage_info:
+                    logger.warning(
+                        f"Failed to get usage info for {device_name}. "
+                        "Skipping metrics update."
                     )
+                    return
+                logger.info(
+                    f"Usage info for {device_name}: "
+                    f"today_energy={getattr(usage_info, 'today_energy', 0)}Wh, "
+                    f"month_energy={getattr(usage_info, 'month_energy', 0)}Wh, "
+                    f"today_runtime={getattr(usage_info, 'today_runtime', 0)}min, "
+                    f"month_runtime={getattr(usage_info, 'month_runtime', 0)}min, "
+                    f"power_saved={getattr(usage_info, 'power_saved', 0)}Wh, "
+                    f"power_protection="
+                    f"{getattr(usage_info, 'power_protection', False)}, "
+                    f"overcurrent_protection="
+                    f"{getattr(usage_info, 'overcurrent_protection', False)}, "
+                    f"overheat_protection="
+                    f"{getattr(usage_info, 'overheat_protection', False)}, "
+                    f"signal_strength={getattr(usage_info, 'signal_strength', 0)}"
+                )
+            except Exception as e:
+                logger.error(
+                    f"Error getting usage info for {device_name}: {str(e)}\n"
+                    f"Traceback: {traceback.format_exc()}"
+                )
+                return
 
-                current = power / voltage if voltage > 0 else 0
+            # Update metrics
+            try:
+                await self.metrics.update_metrics(device)
+            except Exception as e:
+                logger.error(
+                    f"Error updating metrics for {device_name}: {str(e)}\n"
+                    f"Traceback: {traceback.format_exc()}"
+                )
+                return
+
+            # Calculate current based on power and voltage
+            voltage = int(getattr(power_info, "voltage", 0))
+            power = int(getattr(power_info, "current_power", 0))
+            current_ma = int(getattr(power_info, "current", 0))
+            power_factor = float(getattr(power_info, "power_factor", 0))
+
+            # If voltage is 0, determine appropriate voltage based on power
+            if voltage == 0:
+                # Assume 240V for high-power devices (typically over 1800W)
+                voltage = (
+                    STANDARD_VOLTAGE_240V if power > 1800 else STANDARD_VOLTAGE_120V
+                )
                 logger.info(
-                    f"Calculated current for {device_name}: {current:.2f}A "
-                    f"(power={power}W, voltage={voltage}V)"
+                    f"Using default voltage for {device_name}: {voltage}V "
+                    f"(power={power}W)"
                 )
 
-                # Calculate energy since last update
-                time_diff = current_time - self.last_update_time[device_name]
-                avg_power = (power + self.last_power_readings[device_name]) / 2
-                energy_increment = (
-                    avg_power * time_diff
-                ) / 3600  # Convert to watt-hours
+            current = power / voltage if voltage > 0 else 0
+            logger.info(
+                f"Calculated current for {device_name}: {current:.2f}A "
+                f"(power={power}W, voltage={voltage}V)"
+            )
 
-                # Update accumulated energy
-                self.accumulated_energy[device_name] += energy_increment
+            # Calculate energy since last update
+            time_diff = current_time - self.last_update_time[device_name]
+            avg_power = (power + self.last_power_readings[device_name]) / 2
+            energy_increment = (avg_power * time_diff) / 3600  # Convert to watt-hours
 
-                # Calculate cost
-                cost_increment = self.calculate_cost(energy_increment)
-                self.daily_cost[device_name] += cost_increment
+            # Update accumulated energy
+            self.accumulated_energy[device_name] += energy_increment
 
-                logger.info(
-                    f"Energy calculation for {device_name}: "
-                    f"time_diff={time_diff:.2f}s, "
-                    f"avg_power={avg_power:.2f}W, "
-                    f"energy_increment={energy_increment:.4f}Wh, "
-                    f"total_accumulated={self.accumulated_energy[device_name]:.4f}Wh, "
-                    f"cost_increment=${cost_increment:.4f}, "
-                    f"total_cost=${self.daily_cost[device_name]:.4f}"
-                )
+            # Calculate cost
+            cost_increment = self.calculate_cost(energy_increment)
+            self.daily_cost[device_name] += cost_increment
 
-                # Update stored values
-                self.last_power_readings[device_name] = power
-                self.last_update_time[device_name] = current_time
+            logger.info(
+                f"Energy calculation for {device_name}: "
+                f"time_diff={time_diff:.2f}s, "
+                f"avg_power={avg_power:.2f}W, "
+                f"energy_increment={energy_increment:.4f}Wh, "
+                f"total_accumulated={self.accumulated_energy[device_name]:.4f}Wh, "
+                f"cost_increment=${cost_increment:.4f}, "
+                f"total_cost=${self.daily_cost[device_name]:.4f}"
+            )
 
-                # Get usage info
-                today_energy = int(getattr(usage_info, "today_energy", 0))
-                month_energy = int(getattr(usage_info, "month_energy", 0))
-                today_runtime = int(getattr(usage_info, "today_runtime", 0))
-                month_runtime = int(getattr(usage_info, "month_runtime", 0))
-                power_saved = int(getattr(usage_info, "power_saved", 0))
-                power_protection = bool(getattr(usage_info, "power_protection", False))
-                overcurrent_protection = bool(
-                    getattr(usage_info, "overcurrent_protection", False)
-                )
-                overheat_protection = bool(
-                    getattr(usage_info, "overheat_protection", False)
-                )
-                signal_strength = int(getattr(usage_info, "signal_strength", 0))
+            # Update stored values
+            self.last_power_readings[device_name] = power
+            self.last_update_time[device_name] = current_time
+
+            # Get usage info
+            today_energy = int(getattr(usage_info, "today_energy", 0))
+            month_energy = int(getattr(usage_info, "month_energy", 0))
+            today_runtime = int(getattr(usage_info, "today_runtime", 0))
+            month_runtime = int(getattr(usage_info, "month_runtime", 0))
+            power_saved = int(getattr(usage_info, "power_saved", 0))
+            power_protection = bool(getattr(usage_info, "power_protection", False))
+            overcurrent_protection = bool(
+                getattr(usage_info, "overcurrent_protection", False)
+            )
+            overheat_protection = bool(
+                getattr(usage_info, "overheat_protection", False)
+            )
+            signal_strength = int(getattr(usage_info, "signal_strength", 0))
 
-                # Use accumulated energy if device reports 0
-                if today_energy == 0:
-                    today_energy = int(self.accumulated_energy[device_name])
-                if month_energy == 0:
-                    month_energy = int(self.accumulated_energy[device_name])
+            # Use accumulated energy if device reports 0
+            if today_energy == 0:
+                today_energy = int(self.accumulated_energy[device_name])
+            if month_energy == 0:
+                month_energy = int(self.accumulated_energy[device_name])
 
-                # Calculate costs
-                today_cost = self.calculate_cost(today_energy)
-                month_cost = self.calculate_cost(month_energy)
+            # Calculate costs
+            today_cost = self.calculate_cost(today_energy)
+            month_cost = self.calculate_cost(month_energy)
+
+            logger.info(
+                f"Final energy values for {device_name}: "
+                f"today_energy={today_energy}Wh, "
+                f"month_energy={month_energy}Wh, "
+                f"today_runtime={today_runtime}min, "
+                f"month_runtime={month_runtime}min, "
+                f"power_saved={power_saved}Wh, "
+                f"accumulated={self.accumulated_energy[device_name]:.4f}Wh, "
+                f"today_cost=${today_cost:.4f}, "
+                f"month_cost=${month_cost:.4f}"
+            )
 
+            # Write metrics to InfluxDB
+            try:
+                from influxdb_client import Point
+
+                point = (
+                    Point("tapo_metrics")
+                    .tag("device_name", device_name)
+                    .tag("device_type", device_info.get("model", "unknown").lower())
+                    .tag("fw_version", device_info.get("fw_ver", "unknown"))
+                    .tag("hw_version", device_info.get("hw_ver", "unknown"))
+                    .tag("device_id", device_info.get("device_id", "unknown"))
+                    .tag("mac", device_info.get("mac", "unknown"))
+                    .tag("ip", device_info.get("ip", "unknown"))
+                    .tag("ssid", device_info.get("ssid", "unknown"))
+                    .field("power_watts", power)
+                    .field("voltage_volts", voltage)
+                    .field("current_amps", current)
+                    .field("current_milliamps", current_ma)
+                    .field("power_factor", power_factor)
+                    .field("today_energy_wh", today_energy)
+                    .field("month_energy_wh", month_energy)
+                    .field("today_runtime_minutes", today_runtime)
+                    .field("month_runtime_minutes", month_runtime)
+                    .field("power_saved_wh", power_saved)
+                    .field(
+                        "accumulated_energy_wh",
+                        self.accumulated_energy[device_name],
+                    )
+                    .field("power_protection", int(power_protection))
+                    .field("overcurrent_protection", int(overcurrent_protection))
+                    .field("overheat_protection", int(overheat_protection))
+                    .field("signal_strength", signal_strength)
+                    .field("signal_level", int(device_info.get("signal_level", 0)))
+                    .field("today_cost_usd", today_cost)
+                    .field("month_cost_usd", month_cost)
+                    .field("accumulated_cost_usd", self.daily_cost[device_name])
+                )
+
+                self.write_api.write(bucket="tapo", record=point)
                 logger.info(
-                    f"Final energy values for {device_name}: "
+                    f"Wrote metrics to InfluxDB for device {device_name}: "
+                    f"power={power}W, voltage={voltage}V, "
+                    f"current={current:.2f}A, "
                     f"today_energy={today_energy}Wh, "
                     f"month_energy={month_energy}Wh, "
-                    f"today_runtime={today_runtime}min, "
-                    f"month_runtime={month_runtime}min, "
-                    f"power_saved={power_saved}Wh, "
                     f"accumulated={self.accumulated_energy[device_name]:.4f}Wh, "
                     f"today_cost=${today_cost:.4f}, "
                     f"month_cost=${month_cost:.4f}"
                 )
 
-                # Write metrics to InfluxDB
-                try:
-                    from influxdb_client import Point
-
-                    point = (
-                        Point("tapo_metrics")
-                        .tag("device_name", device_name)
-                        .tag("device_type", device_info.get("model", "unknown").lower())
-                        .tag("fw_version", device_info.get("fw_ver", "unknown"))
-                        .tag("hw_version", device_info.get("hw_ver", "unknown"))
-                        .tag("device_id", device_info.get("device_id", "unknown"))
-                        .tag("mac", device_info.get("mac", "unknown"))
-                        .tag("ip", device_info.get("ip", "unknown"))
-                        .tag("ssid", device_info.get("ssid", "unknown"))
-                        .field("power_watts", power)
-                        .field("voltage_volts", voltage)
-                        .field("current_amps", current)
-                        .field("current_milliamps", current_ma)
-                        .field("power_factor", power_factor)
-                        .field("today_energy_wh", today_energy)
-                        .field("month_energy_wh", month_energy)
-                        .field("today_runtime_minutes", today_runtime)
-                        .field("month_runtime_minutes", month_runtime)
-                        .field("power_saved_wh", power_saved)
-                        .field(
-                            "accumulated_energy_wh",
-                            self.accumulated_energy[device_name],
-                        )
-                        .field("power_protection", int(power_protection))
-                        .field("overcurrent_protection", int(overcurrent_protection))
-                        .field("overheat_protection", int(overheat_protection))
-                        .field("signal_strength", signal_strength)
-                        .field("signal_level", int(device_info.get("signal_level", 0)))
-                        .field("today_cost_usd", today_cost)
-                        .field("month_cost_usd", month_cost)
-                        .field("accumulated_cost_usd", self.daily_cost[device_name])
-                    )
-
-                    self.write_api.write(bucket="tapo", record=point)
-                    logger.info(
-                        f"Wrote metrics to InfluxDB for device {device_name}: "
-                        f"power={power}W, voltage={voltage}V, "
-                        f"current={current:.2f}A, "
-                        f"today_energy={today_energy}Wh, "
-                        f"month_energy={month_energy}Wh, "
-                        f"accumulated={self.accumulated_energy[device_name]:.4f}Wh, "
-                        f"today_cost=${today_cost:.4f}, "
-                        f"month_cost=${month_cost:.4f}"
-                    )
-
-                except Exception as e:
-                    logger.error(
-                        f"Failed to write metrics to InfluxDB for device {device_name}: "
-                        f"{str(e)}\nTraceback: {traceback.format_exc()}"
-                    )
-
             except Exception as e:
                 logger.error(
-                    f"Error updating metrics for device {device_name}: {str(e)}\n"
-                    f"Traceback: {traceback.format_exc()}"
+                    f"Failed to write metrics to InfluxDB for device {device_name}: "
+                    f"{str(e)}\nTraceback: {traceback.format_exc()}"
                 )
-                continue
+
+        except Exception as e:
+            logger.error(
+                f"Error updating metrics for device {device_name}: {str(e)}\n"
+                f"Traceback: {traceback.format_exc()}"
+            )
 
     async def start(self, port: int = 0) -> None:
         """Start the exporter.
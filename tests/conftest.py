@@ -2,10 +2,19 @@
 
 from unittest.mock import MagicMock
 import pytest
+from tapo_exporter.devices import base
 from tapo_exporter.exporter import TapoExporter
 from tapo_exporter.metrics import TapoMetrics
 
 
+@pytest.fixture(autouse=True)
+def clear_client_cache():
+    """Drop ApiClient instances shared between tests."""
+    base._CLIENT_CACHE.clear()
+    yield
+    base._CLIENT_CACHE.clear()
+
+
 @pytest.fixture
 def metrics():
     """Create a TapoMetrics instance for testing."""
@@ -1,10 +1,9 @@
 """Tests for the devices module."""
 
-import tempfile
 from unittest.mock import AsyncMock, MagicMock, call, patch
 import pytest
 from tapo_exporter.devices.base import BaseTapoDevice
-from tapo_exporter.devices.p110 import P110Device
+from tapo_exporter.devices.p110 import P110Device, clean_credentials
 
 
 class TestTapoDevice(BaseTapoDevice):
@@ -310,12 +309,13 @@ async def test_p110_device_initialization():
 @pytest.mark.asyncio
 async def test_p110_device_connection():
     """Test P110 device connection."""
-    with patch("tapo_exporter.devices.p110.ApiClient") as mock_api_client:
+    with patch("tapo_exporter.devices.base.ApiClient") as mock_api_client:
         device = P110Device(
             ip="192.168.1.100",
             email="test@example.com",
             password="password",
             name="Test Device",
+            device_type="p115",
         )
 
         mock_client = AsyncMock()
@@ -334,15 +334,46 @@ async def test_p110_device_connection():
         mock_p115.assert_called_once_with("192.168.1.100")
 
 
+@pytest.mark.asyncio
+async def test_p110_devices_share_client():
+    """Test that devices with the same credentials share one ApiClient."""
+    with patch("tapo_exporter.devices.base.ApiClient") as mock_api_client:
+        mock_client = AsyncMock()
+        mock_api_client.return_value = mock_client
+        first = P110Device(
+            ip="192.168.1.100",
+            email="test@example.com",
+            password="password",
+            name="First",
+            device_type="p115",
+        )
+        second = P110Device(
+            ip="192.168.1.101",
+            email="test@example.com",
+            password="password",
+            name="Second",
+            device_type="p115",
+        )
+
+        await first.connect()
+        await second.connect()
+
+        mock_api_client.assert_called_once_with("test@example.com", "password")
+        assert first.client is second.client is mock_client
+        mock_client.p115.assert_any_call("192.168.1.100")
+        mock_client.p115.assert_any_call("192.168.1.101")
+
+
 @pytest.mark.asyncio
 async def test_p110_device_get_info():
     """Test P110 device get_info method."""
-    with patch("tapo_exporter.devices.p110.ApiClient") as mock_api_client:
+    with patch("tapo_exporter.devices.base.ApiClient") as mock_api_client:
         device = P110Device(
             ip="192.168.1.100",
             email="test@example.com",
             password="password",
             name="Test Device",
+            device_type="p115",
         )
 
         # Mock the API client and device
@@ -394,12 +425,13 @@ async def test_p110_device_get_info():
 @pytest.mark.asyncio
 async def test_p110_device_get_current_power():
     """Test P110 device get_current_power method."""
-    with patch("tapo_exporter.devices.p110.ApiClient") as mock_api_client:
+    with patch("tapo_exporter.devices.base.ApiClient") as mock_api_client:
         device = P110Device(
             ip="192.168.1.100",
             email="test@example.com",
             password="password",
             name="Test Device",
+            device_type="p115",
         )
 
         # Mock the API client and device
@@ -433,12 +465,13 @@ async def test_p110_device_get_current_power():
 @pytest.mark.asyncio
 async def test_p110_device_get_device_usage():
     """Test P110 device get_device_usage method."""
-    with patch("tapo_exporter.devices.p110.ApiClient") as mock_api_client:
+    with patch("tapo_exporter.devices.base.ApiClient") as mock_api_client:
         device = P110Device(
             ip="192.168.1.100",
             email="test@example.com",
             password="password",
             name="Test Device",
+            device_type="p115",
         )
 
         # Mock the API client and device
@@ -482,7 +515,7 @@ async def test_p110_device_get_device_usage():
 @pytest.mark.asyncio
 async def test_p110_device_connection_error():
     """Test P110 device connection error handling."""
-    with patch("tapo_exporter.devices.p110.ApiClient") as mock_api_client:
+    with patch("tapo_exporter.devices.base.ApiClient") as mock_api_client:
         device = P110Device(
             ip="192.168.1.100",
             email="test@example.com",
@@ -503,12 +536,13 @@ async def test_p110_device_connection_error():
 @pytest.mark.asyncio
 async def test_p110_device_get_info_error():
     """Test P110 device get_info error handling."""
-    with patch("tapo_exporter.devices.p110.ApiClient") as mock_api_client:
+    with patch("tapo_exporter.devices.base.ApiClient") as mock_api_client:
         device = P110Device(
             ip="192.168.1.100",
             email="test@example.com",
             password="password",
             name="Test Device",
+            device_type="p115",
         )
 
         # Mock the API client and device
@@ -536,12 +570,13 @@ async def test_p110_device_get_info_error():
 @pytest.mark.asyncio
 async def test_p110_device_get_current_power_error():
     """Test P110 device get_current_power error handling."""
-    with patch("tapo_exporter.devices.p110.ApiClient") as mock_api_client:
+    with patch("tapo_exporter.devices.base.ApiClient") as mock_api_client:
         device = P110Device(
             ip="192.168.1.100",
             email="test@example.com",
             password="password",
             name="Test Device",
+            device_type="p115",
         )
 
         # Mock the API client and device
@@ -572,12 +607,13 @@ async def test_p110_device_get_current_power_error():
 @pytest.mark.asyncio
 async def test_p110_device_get_device_usage_error():
     """Test P110 device get_device_usage error handling."""
-    with patch("tapo_exporter.devices.p110.ApiClient") as mock_api_client:
+    with patch("tapo_exporter.devices.base.ApiClient") as mock_api_client:
         device = P110Device(
             ip="192.168.1.100",
             email="test@example.com",
             password="password",
             name="Test Device",
+            device_type="p115",
         )
 
         # Mock the API client and device
@@ -608,12 +644,13 @@ async def test_p110_device_get_device_usage_error():
 @pytest.mark.asyncio
 async def test_p110_device_reconnect():
     """Test P110 device reconnect functionality."""
-    with patch("tapo_exporter.devices.p110.ApiClient") as mock_api_client:
+    with patch("tapo_exporter.devices.base.ApiClient") as mock_api_client:
         device = P110Device(
             ip="192.168.1.100",
             email="test@example.com",
             password="password",
             name="Test Device",
+            device_type="p115",
         )
 
         # Mock the API client and device
@@ -647,127 +684,99 @@ async def test_p110_device_reconnect():
         assert device.device == mock_device
 
 
-@pytest.mark.asyncio
-async def test_p110_device_clean_credentials():
-    """Test P110 device credential cleanup."""
-    with patch("tapo_exporter.devices.p110.glob") as mock_glob, patch(
-        "tapo_exporter.devices.p110.os"
-    ) as mock_os:
-        device = P110Device(
-            ip="192.168.1.100",
-            email="test@example.com",
-            password="password",
-            name="Test Device",
-        )
-
-        # Mock glob.glob to return some test files
-        mock_glob.glob.side_effect = [
-            [
-                tempfile.gettempdir() + "/tapo_1.json",
-                tempfile.gettempdir() + "/tapo_2.json",
-            ],  # tmp files
-            ["tapo_1.json", "tapo_2.json"],  # current dir files
-        ]
+def _fake_scandir(listing):
+    """Build an os.scandir stand-in returning entries for the given names."""
 
-        # Call _clean_credentials
-        device._clean_credentials()
+    def scandir(directory):
+        entries = []
+        for name in listing.get(directory, []):
+            entry = MagicMock()
+            entry.name = name
+            entry.path = f"{directory}/{name}"
+            entries.append(entry)
+        context = MagicMock()
+        context.__enter__.return_value = entries
+        return context
 
-        # Verify that os.remove was called for each file
-        assert mock_os.remove.call_count == 4
-        mock_os.remove.assert_any_call(tempfile.gettempdir() + "/tapo_1.json")
-        mock_os.remove.assert_any_call(tempfile.gettempdir() + "/tapo_2.json")
-        mock_os.remove.assert_any_call("tapo_1.json")
-        mock_os.remove.assert_any_call("tapo_2.json")
+    return scandir
 
 
-@pytest.mark.asyncio
-async def test_p110_device_clean_credentials_error():
-    """Test P110 device credential cleanup error handling."""
-    with patch("tapo_exporter.devices.p110.glob") as mock_glob, patch(
-        "tapo_exporter.devices.p110.os"
-    ) as mock_os, patch("tapo_exporter.devices.p110.logger") as mock_logger:
-        device = P110Device(
-            ip="192.168.1.100",
-            email="test@example.com",
-            password="password",
-            name="Test Device",
+def test_clean_credentials():
+    """Test credential cleanup."""
+    with patch("tapo_exporter.devices.p110.os") as mock_os:
+        mock_os.scandir.side_effect = _fake_scandir(
+            {
+                "/tmp": ["tapo_1.json", "tapo_2", "other.json"],
+                ".": ["tapo_1.json", "tapo_2.json", "tapo_3.txt"],
+            }
         )
 
-        # Mock glob.glob to return some test files
-        mock_glob.glob.side_effect = [
-            [
-                tempfile.gettempdir() + "/tapo_1.json",
-                tempfile.gettempdir() + "/tapo_2.json",
-            ],  # tmp files
-            ["tapo_1.json", "tapo_2.json"],  # current dir files
-        ]
+        clean_credentials()
+
+        # One directory read per location
+        assert mock_os.scandir.call_count == 2
+        assert mock_os.remove.call_count == 4
+        mock_os.remove.assert_any_call("/tmp/tapo_1.json")
+        mock_os.remove.assert_any_call("/tmp/tapo_2")
+        mock_os.remove.assert_any_call("./tapo_1.json")
+        mock_os.remove.assert_any_call("./tapo_2.json")
+
+
+def test_clean_credentials_error():
+    """Test credential cleanup error handling."""
+    with patch("tapo_exporter.devices.p110.os") as mock_os, patch(
+        "tapo_exporter.devices.p110.logger"
+    ) as mock_logger:
+        mock_os.scandir.side_effect = _fake_scandir(
+            {"/tmp": ["tapo_1.json", "tapo_2.json"], ".": ["tapo_1.json"]}
+        )
 
         # Mock os.remove to raise an exception for one file
         mock_os.remove.side_effect = [
-            None,  # First file removed successfully
-            Exception("Failed to remove file"),  # Second file fails
-            None,  # Third file removed successfully
-            None,  # Fourth file removed successfully
+            None,
+            Exception("Failed to remove file"),
+            None,
         ]
 
-        # Call _clean_credentials
-        device._clean_credentials()
+        clean_credentials()
 
-        # Verify that os.remove was called for each file
-        assert mock_os.remove.call_count == 4
-        # Verify that the error was logged
-        temp_file = tempfile.gettempdir() + "/tapo_2.json"
-        error_msg = "Failed to remove {}: Failed to remove file"
-        mock_logger.warning.assert_called_once_with(error_msg.format(temp_file))
+        # Verify that os.remove was still called for each file
+        assert mock_os.remove.call_count == 3
+        mock_logger.warning.assert_called_once_with(
+            "Failed to remove /tmp/tapo_2.json: Failed to remove file"
+        )
 
 
-@pytest.mark.asyncio
-async def test_p110_device_clean_credentials_current_dir_error():
-    """Test P110 device credential cleanup error handling in current directory."""
-    with patch("tapo_exporter.devices.p110.glob") as mock_glob, patch(
-        "tapo_exporter.devices.p110.os"
-    ) as mock_os, patch("tapo_exporter.devices.p110.logger") as mock_logger:
-        device = P110Device(
-            ip="192.168.1.100",
-            email="test@example.com",
-            password="password",
-            name="Test Device",
-        )
+def test_clean_credentials_scan_error():
+    """Test credential cleanup when a directory cannot be read."""
+    with patch("tapo_exporter.devices.p110.os") as mock_os, patch(
+        "tapo_exporter.devices.p110.logger"
+    ) as mock_logger:
+        scandir = _fake_scandir({".": ["tapo_1.json"]})
 
-        # Mock glob.glob to return some test files
-        mock_glob.glob.side_effect = [
-            [],  # No tmp files
-            ["tapo_1.json", "tapo_2.json"],  # current dir files
-        ]
+        def failing_scandir(directory):
+            if directory == "/tmp":
+                raise PermissionError("denied")
+            return scandir(directory)
 
-        # Mock os.remove to raise an exception for current dir file
-        mock_os.remove.side_effect = Exception("Failed to remove file")
+        mock_os.scandir.side_effect = failing_scandir
 
-        # Call _clean_credentials
-        device._clean_credentials()
+        clean_credentials()
 
-        # Verify that os.remove was called for each file
-        assert mock_os.remove.call_count == 2
-        # Verify that the error was logged
-        mock_logger.warning.assert_has_calls(
-            [
-                call("Failed to remove tapo_1.json: Failed to remove file"),
-                call("Failed to remove tapo_2.json: Failed to remove file"),
-            ]
-        )
+        mock_os.remove.assert_called_once_with("./tapo_1.json")
+        mock_logger.warning.assert_called_once_with("Failed to scan /tmp: denied")
 
 
 @pytest.mark.asyncio
 async def test_p110_device_connect_p110_first():
     """Test P110 device connection with P110 as first device type."""
-    with patch("tapo_exporter.devices.p110.ApiClient") as mock_api_client, patch(
-        "tapo_exporter.devices.p110.os.getenv", return_value="p110"
-    ):
+    with patch("tapo_exporter.devices.base.ApiClient") as mock_api_client:
         device = P110Device(
             ip="192.168.1.100",
             email="test@example.com",
             password="password",
             name="Test Device",
+            device_type="p110",
         )
 
         # Mock the API client and device
@@ -823,14 +832,15 @@ async def test_p110_device_not_connected_errors():
 @pytest.mark.asyncio
 async def test_p110_device_connect_alternative_type():
     """Test P110 device connection with alternative device type."""
-    with patch("tapo_exporter.devices.p110.ApiClient") as mock_api_client, patch(
-        "tapo_exporter.devices.p110.os.getenv", return_value="p110"
-    ), patch("tapo_exporter.devices.p110.time.sleep"):
+    with patch("tapo_exporter.devices.base.ApiClient") as mock_api_client, patch(
+        "tapo_exporter.devices.p110.asyncio.sleep", new_callable=AsyncMock
+    ) as mock_sleep:
         device = P110Device(
             ip="192.168.1.100",
             email="test@example.com",
             password="password",
             name="Test Device",
+            device_type="p110",
         )
 
         # Mock the API client and device
@@ -858,6 +868,7 @@ async def test_p110_device_connect_alternative_type():
         mock_p110.assert_called_once_with("192.168.1.100")
         mock_p115.assert_called_once_with("192.168.1.100")
         mock_device.get_device_info.assert_called_once()
+        mock_sleep.assert_awaited_once_with(2)
         assert device.device == mock_device
 
 
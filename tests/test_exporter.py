@@ -105,6 +105,74 @@ async def test_exporter_connect_devices_error(mock_devices, mock_influx_client):
     await exporter.connect_devices()  # Should not raise exception
 
 
+@pytest.mark.asyncio
+async def test_exporter_connect_devices_cleans_credentials_once(
+    mock_devices, mock_influx_client
+):
+    """Test that cached credentials are cleaned once per connect_devices call."""
+    exporter = TapoExporter(devices=mock_devices)
+    for name in ("first", "second"):
+        device = MagicMock()
+        device.name = name
+        device.connect = AsyncMock()
+        exporter.add_device(device)
+
+    with patch("tapo_exporter.exporter.clean_credentials") as mock_clean:
+        await exporter.connect_devices()
+
+    mock_clean.assert_called_once_with()
+
+
+@pytest.mark.asyncio
+async def test_exporter_connect_devices_concurrently(mock_devices, mock_influx_client):
+    """Test that devices are connected concurrently."""
+    exporter = TapoExporter(devices=mock_devices)
+    released = asyncio.Event()
+
+    async def wait_for_peer():
+        await released.wait()
+
+    async def release_peer():
+        released.set()
+
+    first = MagicMock()
+    first.name = "first"
+    first.connect = wait_for_peer
+    second = MagicMock()
+    second.name = "second"
+    second.connect = release_peer
+    exporter.add_device(first)
+    exporter.add_device(second)
+
+    # A sequential implementation would block forever on the first device
+    await asyncio.wait_for(exporter.connect_devices(), timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_exporter_update_metrics_concurrently(mock_devices, mock_influx_client):
+    """Test that devices are polled concurrently."""
+    exporter = TapoExporter(devices=mock_devices)
+    released = asyncio.Event()
+
+    async def wait_for_peer():
+        await released.wait()
+        return None
+
+    async def release_peer():
+        released.set()
+        return None
+
+    for name, get_device_info in (("first", wait_for_peer), ("second", release_peer)):
+        device = MagicMock()
+        device.name = name
+        device.device = MagicMock()
+        device.get_device_info = get_device_info
+        exporter.add_device(device)
+
+    # A sequential implementation would block forever on the first device
+    await asyncio.wait_for(exporter.update_metrics(), timeout=1)
+
+
 @pytest.mark.asyncio
 async def test_exporter_start(mock_devices, mock_influx_client):
     """Test starting the exporter."""
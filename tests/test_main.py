@@ -40,8 +40,10 @@ async def test_main_initialization():
         patch("tapo_exporter.__main__.get_devices_from_env") as mock_get_devices,
         patch("tapo_exporter.__main__.TapoExporter") as mock_exporter_class,
         patch("tapo_exporter.__main__.start_http_server") as mock_start_server,
-        patch("asyncio.get_event_loop") as mock_get_loop,
-        patch("asyncio.sleep", side_effect=asyncio.CancelledError),
+        patch("asyncio.get_running_loop") as mock_get_loop,
+        patch(
+            "tapo_exporter.__main__._wait_for_stop", side_effect=asyncio.CancelledError
+        ),
     ):
         mock_device = MagicMock()
         mock_get_devices.return_value = [mock_device]
@@ -85,12 +87,14 @@ async def test_main_device_creation_from_env(monkeypatch):
                 ip="192.168.1.1",
                 email="email1@test.com",
                 password="pass1",
+                device_type="p110",
             ),
             call(
                 name="Device 2",
                 ip="192.168.1.2",
                 email="email2@test.com",
                 password="pass2",
+                device_type="p115",
             ),
         ]
         mock_p110_class.assert_has_calls(expected_calls, any_order=True)
@@ -107,7 +111,7 @@ async def test_main_exporter_start(monkeypatch):
 
     with patch("tapo_exporter.__main__.TapoExporter") as mock_exporter_class, patch(
         "tapo_exporter.__main__.start_http_server"
-    ), patch("asyncio.get_event_loop"), patch(
+    ), patch("asyncio.get_running_loop"), patch(
         "asyncio.sleep", side_effect=asyncio.CancelledError
     ):  # Stop loop
 
@@ -137,8 +141,8 @@ async def test_main_signal_handling(monkeypatch):
     with (
         patch("tapo_exporter.__main__.start_http_server"),
         patch("tapo_exporter.__main__.TapoExporter") as mock_exporter_class,
-        patch("asyncio.get_event_loop") as mock_get_loop,
-        patch("asyncio.sleep", side_effect=KeyboardInterrupt),
+        patch("asyncio.get_running_loop") as mock_get_loop,
+        patch("tapo_exporter.__main__._wait_for_stop", side_effect=KeyboardInterrupt),
     ):
         mock_exporter_instance = AsyncMock()
         mock_exporter_class.return_value = mock_exporter_instance
@@ -171,7 +175,7 @@ async def test_main_error_handling(monkeypatch):
         patch("tapo_exporter.__main__.start_http_server"),
         patch("tapo_exporter.__main__.TapoExporter") as mock_exporter_class,
         patch("tapo_exporter.__main__.logger") as mock_logger,
-        patch("asyncio.get_event_loop"),
+        patch("asyncio.get_running_loop"),
     ):
         mock_exporter_instance = AsyncMock()
         mock_exporter_instance.connect_devices.side_effect = Exception(
@@ -202,7 +206,7 @@ async def test_main_cleanup_on_error(monkeypatch):
         patch("tapo_exporter.__main__.start_http_server"),
         patch("tapo_exporter.__main__.get_devices_from_env") as mock_get_devices,
         patch("tapo_exporter.__main__.TapoExporter") as mock_exporter_class,
-        patch("asyncio.get_event_loop", return_value=MagicMock()),
+        patch("asyncio.get_running_loop", return_value=MagicMock()),
     ):
         # Create a device and mock the exporter
         mock_device = MagicMock()
@@ -258,7 +262,11 @@ def test_get_devices_from_env_missing_config(monkeypatch):
 
         assert len(devices) == 1  # Only Device 1 should be added
         mock_p110_class.assert_called_once_with(
-            name="Device 1", ip="192.168.1.1", email="email1@test.com", password="pass1"
+            name="Device 1",
+            ip="192.168.1.1",
+            email="email1@test.com",
+            password="pass1",
+            device_type="p110",
         )
         # Check that a warning was logged for the missing config
         mock_logger.warning.assert_any_call(
@@ -284,7 +292,11 @@ def test_get_devices_from_env_invalid_type(monkeypatch):
 
         assert len(devices) == 1
         mock_p110_class.assert_called_once_with(
-            name="Device 1", ip="192.168.1.1", email="email1@test.com", password="pass1"
+            name="Device 1",
+            ip="192.168.1.1",
+            email="email1@test.com",
+            password="pass1",
+            device_type="p110",
         )  # Should still create P110Device
         # Check that a warning was logged for the invalid type
         mock_logger.warning.assert_any_call(
@@ -320,7 +332,7 @@ async def test_main_connect_devices_error(monkeypatch):
 
     with patch("tapo_exporter.__main__.TapoExporter") as mock_exporter_class, patch(
         "tapo_exporter.__main__.start_http_server"
-    ), patch("asyncio.get_event_loop"), patch(
+    ), patch("asyncio.get_running_loop"), patch(
         "tapo_exporter.__main__.logger"
     ) as mock_logger:
 
@@ -352,10 +364,10 @@ async def test_main_loop_error(monkeypatch):
 
     with patch("tapo_exporter.__main__.TapoExporter") as mock_exporter_class, patch(
         "tapo_exporter.__main__.start_http_server"
-    ), patch("asyncio.get_event_loop"), patch(
+    ), patch("asyncio.get_running_loop"), patch(
         "tapo_exporter.__main__.logger"
     ) as mock_logger, patch(
-        "asyncio.sleep"
+        "tapo_exporter.__main__._wait_for_stop"
     ) as mock_sleep:
 
         mock_exporter_instance = AsyncMock(spec=TapoExporter)
@@ -390,9 +402,9 @@ async def test_main_keyboard_interrupt(monkeypatch):
     with (
         patch("tapo_exporter.__main__.TapoExporter"),
         patch("tapo_exporter.__main__.start_http_server"),
-        patch("asyncio.get_event_loop"),
+        patch("asyncio.get_running_loop"),
         patch("tapo_exporter.__main__.logger") as mock_logger,
-        patch("asyncio.sleep", side_effect=KeyboardInterrupt),
+        patch("tapo_exporter.__main__._wait_for_stop", side_effect=KeyboardInterrupt),
     ):
         await __main__.main()
         # Check logger calls
@@ -448,8 +460,10 @@ async def test_main_with_custom_port(monkeypatch):
     with (
         patch("tapo_exporter.__main__.TapoExporter") as mock_exporter_class,
         patch("tapo_exporter.__main__.start_http_server") as mock_start_server,
-        patch("asyncio.get_event_loop"),
-        patch("asyncio.sleep", side_effect=asyncio.CancelledError),
+        patch("asyncio.get_running_loop"),
+        patch(
+            "tapo_exporter.__main__._wait_for_stop", side_effect=asyncio.CancelledError
+        ),
     ):
         mock_exporter_instance = AsyncMock(spec=TapoExporter)
         mock_exporter_class.return_value = mock_exporter_instance
@@ -473,7 +487,7 @@ async def test_main_with_invalid_port(monkeypatch):
     with (
         patch("tapo_exporter.__main__.TapoExporter"),
         patch("tapo_exporter.__main__.start_http_server"),
-        patch("asyncio.get_event_loop"),
+        patch("asyncio.get_running_loop"),
         patch("tapo_exporter.__main__.logger") as mock_logger,
     ):
         await __main__.main()
@@ -495,8 +509,10 @@ async def test_main_with_custom_log_level(monkeypatch):
     with (
         patch("tapo_exporter.__main__.TapoExporter") as mock_exporter_class,
         patch("tapo_exporter.__main__.start_http_server"),
-        patch("asyncio.get_event_loop"),
-        patch("asyncio.sleep", side_effect=asyncio.CancelledError),
+        patch("asyncio.get_running_loop"),
+        patch(
+            "tapo_exporter.__main__._wait_for_stop", side_effect=asyncio.CancelledError
+        ),
     ):
         mock_exporter_instance = AsyncMock(spec=TapoExporter)
         mock_exporter_class.return_value = mock_exporter_instance
@@ -521,8 +537,10 @@ async def test_main_with_multiple_devices(monkeypatch):
     with (
         patch("tapo_exporter.__main__.TapoExporter") as mock_exporter_class,
         patch("tapo_exporter.__main__.start_http_server"),
-        patch("asyncio.get_event_loop"),
-        patch("asyncio.sleep", side_effect=asyncio.CancelledError),
+        patch("asyncio.get_running_loop"),
+        patch(
+            "tapo_exporter.__main__._wait_for_stop", side_effect=asyncio.CancelledError
+        ),
     ):
         mock_exporter_instance = AsyncMock(spec=TapoExporter)
         mock_exporter_class.return_value = mock_exporter_instance
@@ -546,7 +564,7 @@ async def test_main_with_device_connection_retry(monkeypatch):
     with (
         patch("tapo_exporter.__main__.TapoExporter") as mock_exporter_class,
         patch("tapo_exporter.__main__.start_http_server"),
-        patch("asyncio.get_event_loop"),
+        patch("asyncio.get_running_loop"),
         patch("tapo_exporter.__main__.logger") as mock_logger,
     ):
         mock_exporter_instance = AsyncMock(spec=TapoExporter)
@@ -611,9 +629,9 @@ async def test_main_cancelled_error_handler(monkeypatch):
     with (
         patch("tapo_exporter.__main__.start_http_server"),
         patch("tapo_exporter.__main__.TapoExporter") as mock_exporter_class,
-        patch("asyncio.get_event_loop"),
+        patch("asyncio.get_running_loop"),
         patch("tapo_exporter.__main__.logger") as mock_logger,
-        patch("asyncio.sleep") as mock_sleep,
+        patch("tapo_exporter.__main__._wait_for_stop") as mock_sleep,
     ):
         mock_exporter_instance = AsyncMock()
         mock_exporter_class.return_value = mock_exporter_instance
@@ -653,3 +671,75 @@ async def test_main_entry_point():
         finally:
             # Restore the original main function
             __main__.main = original_main
+
+
+@pytest.mark.asyncio
+async def test_main_loop_deadline_scheduling(monkeypatch):
+    """Test that the loop sleeps only for the remainder of the interval."""
+    monkeypatch.setenv("TAPO_DEVICE_COUNT", "1")
+    monkeypatch.setenv("TAPO_DEVICE_1_NAME", "Device 1")
+    monkeypatch.setenv("TAPO_DEVICE_1_IP", "192.168.1.1")
+    monkeypatch.setenv("TAPO_DEVICE_1_EMAIL", "email1@test.com")
+    monkeypatch.setenv("TAPO_DEVICE_1_PASSWORD", "pass1")
+
+    with (
+        patch("tapo_exporter.__main__.TapoExporter") as mock_exporter_class,
+        patch("tapo_exporter.__main__.start_http_server"),
+        patch("asyncio.get_running_loop"),
+        # Start at t=100, the first update finishes at t=100.5
+        patch("tapo_exporter.__main__.time.monotonic", side_effect=[100.0, 100.5]),
+        patch(
+            "tapo_exporter.__main__._wait_for_stop", side_effect=asyncio.CancelledError
+        ) as mock_sleep,
+    ):
+        mock_exporter_class.return_value = AsyncMock(spec=TapoExporter)
+
+        with pytest.raises(asyncio.CancelledError):
+            await __main__.main()
+
+        mock_sleep.assert_called_once_with(unittest.mock.ANY, pytest.approx(1.5))
+
+
+@pytest.mark.asyncio
+async def test_main_loop_skips_missed_ticks(monkeypatch):
+    """Test that an overrunning update skips missed ticks instead of catching up."""
+    monkeypatch.setenv("TAPO_SCRAPE_INTERVAL", "5")
+    monkeypatch.setenv("TAPO_DEVICE_COUNT", "1")
+    monkeypatch.setenv("TAPO_DEVICE_1_NAME", "Device 1")
+    monkeypatch.setenv("TAPO_DEVICE_1_IP", "192.168.1.1")
+    monkeypatch.setenv("TAPO_DEVICE_1_EMAIL", "email1@test.com")
+    monkeypatch.setenv("TAPO_DEVICE_1_PASSWORD", "pass1")
+
+    with (
+        patch("tapo_exporter.__main__.TapoExporter") as mock_exporter_class,
+        patch("tapo_exporter.__main__.start_http_server"),
+        patch("asyncio.get_running_loop"),
+        # Start at t=100, the first update overruns the 5s interval
+        patch("tapo_exporter.__main__.time.monotonic", side_effect=[100.0, 107.0]),
+        patch(
+            "tapo_exporter.__main__._wait_for_stop", side_effect=asyncio.CancelledError
+        ) as mock_sleep,
+    ):
+        mock_exporter_class.return_value = AsyncMock(spec=TapoExporter)
+
+        with pytest.raises(asyncio.CancelledError):
+            await __main__.main()
+
+        mock_sleep.assert_called_once_with(unittest.mock.ANY, 0.0)
+
+
+@pytest.mark.asyncio
+async def test_main_invalid_scrape_interval(monkeypatch):
+    """Test main with an invalid TAPO_SCRAPE_INTERVAL."""
+    monkeypatch.setenv("TAPO_SCRAPE_INTERVAL", "soon")
+
+    with (
+        patch("tapo_exporter.__main__.start_http_server") as mock_start_server,
+        patch("tapo_exporter.__main__.logger") as mock_logger,
+    ):
+        await __main__.main()
+
+        mock_start_server.assert_not_called()
+        mock_logger.error.assert_called_once_with(
+            "Invalid TAPO_SCRAPE_INTERVAL value: soon"
+        )